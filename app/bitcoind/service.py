@@ -19,7 +19,11 @@ from app.bitcoind.models import (
     NetworkInfo,
     RawTransaction,
 )
-from app.bitcoind.utils import bitcoin_config, bitcoin_rpc_async
+from app.bitcoind.utils import (
+    bitcoin_config,
+    bitcoin_rpc_async,
+    bitcoin_rpc_batch_async,
+)
 
 _initialized = False
 
@@ -123,8 +127,16 @@ async def get_raw_transaction(txid: str) -> RawTransaction:
 
 @logger.catch(exclude=(HTTPException,))
 async def get_btc_info() -> BtcInfo:
-    binfo = await get_blockchain_info()
-    ninfo = await get_network_info()
+    results = await bitcoin_rpc_batch_async(
+        [("getblockchaininfo", []), ("getnetworkinfo", [])]
+    )
+
+    for result in results:
+        if result["error"] is not None:
+            raise HTTPException(result["status"], detail=result["error"])
+
+    binfo = BlockchainInfo.from_rpc(results[0]["result"])
+    ninfo = NetworkInfo.from_rpc(results[1]["result"])
 
     return BtcInfo.from_rpc(binfo, ninfo)
 
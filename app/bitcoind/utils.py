@@ -1,6 +1,7 @@
 import itertools
 import json
 from types import coroutine
+from typing import List, Optional, Tuple
 
 import aiohttp
 import requests
@@ -65,10 +66,33 @@ def bitcoin_rpc(method: str, params: list = []) -> requests.Response:
 # https://github.com/python/cpython/blob/3.10/Lib/asyncio/tasks.py#L31
 _generate_rpc_id = itertools.count(1).__next__
 
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def _get_session() -> aiohttp.ClientSession:
+    # One session for all calls so aiohttp can reuse the connections
+    # to bitcoind. It must be created from within the running loop.
+    global _session
+
+    if _session is None or _session.closed:
+        auth = aiohttp.BasicAuth(bitcoin_config.username, bitcoin_config.pw)
+        headers = {"Content-type": "text/json"}
+        _session = aiohttp.ClientSession(auth=auth, headers=headers)
+
+    return _session
+
+
+async def bitcoin_rpc_close():
+    """Closes the HTTP session used for the async RPC calls"""
+
+    global _session
+
+    if _session is not None:
+        await _session.close()
+        _session = None
+
 
 async def bitcoin_rpc_async(method: str, params: list = []) -> coroutine:
-    auth = aiohttp.BasicAuth(bitcoin_config.username, bitcoin_config.pw)
-    headers = {"Content-type": "text/json"}
     data = (
         '{"jsonrpc": "2.0", "method": "'
         + method
@@ -76,10 +100,13 @@ async def bitcoin_rpc_async(method: str, params: list = []) -> coroutine:
         + json.dumps(params)
         + "}"
     )
+    return await _post(data)
+
+
+async def _post(data: str):
     try:
-        async with aiohttp.ClientSession(auth=auth, headers=headers) as session:
-            async with session.post(bitcoin_config.rpc_url, data=data) as resp:
-                return await _process_response(resp)
+        async with _get_session().post(bitcoin_config.rpc_url, data=data) as resp:
+            return await _process_response(resp)
 
     except aiohttp.client_exceptions.ClientConnectionError as e:
         return {
@@ -94,6 +121,51 @@ async def bitcoin_rpc_async(method: str, params: list = []) -> coroutine:
         }
 
 
+async def bitcoin_rpc_batch_async(calls: List[Tuple[str, list]]) -> list:
+    """Make several RPC requests to the Bitcoin daemon with a single HTTP request
+
+    Parameters
+    ----------
+    calls : list
+        (method, params) tuples to send
+
+    Returns
+    -------
+    list
+        One response per call, in the order of the calls. Each response has
+        the same format as the one returned by bitcoin_rpc_async, errors are
+        mapped to the same status codes. Unknown errors get a 500 status with
+        the message from Bitcoin Core.
+    """
+    ids = [_generate_rpc_id() for _ in calls]
+    data = json.dumps(
+        [
+            {"jsonrpc": "2.0", "method": method, "id": id, "params": params}
+            for id, (method, params) in zip(ids, calls)
+        ]
+    )
+
+    res = await _post(data)
+    if not isinstance(res, list):
+        # the whole batch failed
+        return [res] * len(calls)
+
+    # bitcoind doesn't guarantee the order of the responses
+    by_id = {r["id"]: r for r in res}
+    results = []
+    for id in ids:
+        r = by_id[id]
+        if r["error"] is not None:
+            m = r["error"]["message"]
+            r = _map_rpc_error(m) or {
+                "error": m,
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            }
+        results.append(r)
+
+    return results
+
+
 async def _process_response(resp: aiohttp.ClientResponse):
     if resp.status == status.HTTP_200_OK:
         return await resp.json()
@@ -120,30 +192,43 @@ async def _process_response(resp: aiohttp.ClientResponse):
     m = e["error"]["message"]
 
     if e["error"]:
-        if (
-            "Loading block index" in m
-            or "Verifying blocks" in m
-            or "Starting network threads" in m
-        ):
-            return {
-                "error": (
-                    "Initializing Bitcoin Core (loading, verifying "
-                    "blocks or starting network threads etc)"
-                ),
-                "status": status.HTTP_425_TOO_EARLY,
-            }
-        if "No such mempool or blockchain transaction." in m:
-            return {
-                "error": "No such mempool or blockchain transaction.",
-                "status": status.HTTP_404_NOT_FOUND,
-            }
-        if "parameter 1 must be of length 64" in m:
-            return {
-                "error": m,
-                "status": status.HTTP_400_BAD_REQUEST,
-            }
+        error = _map_rpc_error(m)
+        if error is not None:
+            return error
 
     return {
         "error": f"Unknown answer from Bitcoin Core. Reason: {resp.reason}",
         "status": resp.status,
     }
+
+
+def _map_rpc_error(m: str) -> Optional[dict]:
+    """Maps a known Bitcoin Core error message to an error response
+
+    Returns None if the message is not known.
+    """
+
+    if (
+        "Loading block index" in m
+        or "Verifying blocks" in m
+        or "Starting network threads" in m
+    ):
+        return {
+            "error": (
+                "Initializing Bitcoin Core (loading, verifying "
+                "blocks or starting network threads etc)"
+            ),
+            "status": status.HTTP_425_TOO_EARLY,
+        }
+    if "No such mempool or blockchain transaction." in m:
+        return {
+            "error": "No such mempool or blockchain transaction.",
+            "status": status.HTTP_404_NOT_FOUND,
+        }
+    if "parameter 1 must be of length 64" in m:
+        return {
+            "error": m,
+            "status": status.HTTP_400_BAD_REQUEST,
+        }
+
+    return None
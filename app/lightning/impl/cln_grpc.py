@@ -1,11 +1,19 @@
 import asyncio
+import itertools
 import json
+import os
+import re
 import sys
-from typing import AsyncGenerator, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from typing import AsyncGenerator, Callable, List, Optional, Set, Tuple
 
 import grpc
 from decouple import config
 from fastapi.exceptions import HTTPException
+from google.protobuf.internal import api_implementation
 from loguru import logger
 from starlette import status
 
@@ -33,89 +41,435 @@ from app.lightning.models import (
     PaymentRequest,
     SendCoinsInput,
     SendCoinsResponse,
-    TxStatus,
     WalletBalance,
 )
 from app.lightning.utils import alias_or_empty, generic_grpc_error_handler
 
+_SOCKET_BUFFER_SIZE_LIMIT = 1024 * 1024 * 10  # 10 MB
+_BROADCAST_QUEUE_SIZE = 1000  # items buffered per subscriber
+
+# Requests without arguments never change, so we build them only once.
+_REQ_GET_INFO = ln.GetinfoRequest()
+_REQ_LIST_FUNDS = ln.ListfundsRequest()
+_REQ_LIST_INVOICES = ln.ListinvoicesRequest()
+_REQ_LIST_PAYS = ln.ListpaysRequest()
+_REQ_LIST_FORWARDS_SETTLED = ln.ListforwardsRequest(
+    status=ln.ListforwardsRequest.SETTLED
+)
+_REQ_NEW_ADDR = ln.NewaddrRequest()
+# copied and filled in per call, the nested amount is already in place
+_FUNDCHANNEL_TEMPLATE = ln.FundchannelRequest(
+    amount=lnp.AmountOrAll(amount=lnp.Amount())
+)
+
+_OUTPUT_UNCONFIRMED = ln.ListfundsOutputs.UNCONFIRMED
+_OUTPUT_CONFIRMED = ln.ListfundsOutputs.CONFIRMED
+_CHANNEL_NORMAL = lnp.ChanneldNormal
+_INVOICE_UNPAID = ln.ListinvoicesInvoices.UNPAID
+_INVOICE_PAID = ln.ListinvoicesInvoices.PAID
+_PAY_COMPLETE = ln.ListpaysPays.COMPLETE
+_CLOSED_OK = frozenset((ln.CloseResponse.MUTUAL, ln.CloseResponse.UNILATERAL))
+_CLOSE_UNOPENED = ln.CloseResponse.UNOPENED
+
+# bookkeeper event tags
+_TAG_DEPOSIT = "deposit"
+_TAG_WITHDRAWAL = "withdrawal"
+_TAG_ONCHAIN_FEE = "onchain_fee"
+
+# Feerates are never modified, protobuf copies them into the requests
+_FEERATE_URGENT = lnp.Feerate(urgent=True)
+_FEERATE_NORMAL = lnp.Feerate(normal=True)
+_FEERATE_SLOW = lnp.Feerate(slow=True)
+_FEERANGE = (_FEERATE_SLOW, _FEERATE_URGENT)
+# indexed by target_confs clamped to [0, 10], 0 leaves the choice to CLN
+_FEERATE_BY_CONFS = (None, _FEERATE_URGENT) + (_FEERATE_NORMAL,) * 8 + (_FEERATE_SLOW,)
+
+
+def _default_rpc_path() -> str:
+    # same default lightning-cli uses when no lightning-dir is given
+    network = config("network", default="mainnet")
+    network = "bitcoin" if network == "mainnet" else network
+    return os.path.expanduser(f"~/.lightning/{network}/lightning-rpc")
+
+
+class _LRUCache(OrderedDict):
+    """Dict which evicts the least recently used entry beyond maxsize"""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+
+        self.move_to_end(key)
+        return self[key]
+
+    def put(self, key, value) -> None:
+        self[key] = value
+        self.move_to_end(key)
+
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+class _Broadcaster:
+    """Fans out the items of a single async generator to all subscribers
+
+    The source generator is started with the first subscriber and
+    cancelled once the last one is gone. When the source ends, all current
+    subscriptions end too. A subscriber that falls more than maxsize items
+    behind loses the oldest ones.
+    """
+
+    _END = object()
+
+    def __init__(
+        self,
+        source: Callable[[], AsyncGenerator],
+        maxsize: int = _BROADCAST_QUEUE_SIZE,
+    ):
+        self._source = source
+        self._maxsize = maxsize
+        self._queues: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def subscribe(self) -> AsyncGenerator:
+        q = asyncio.Queue(maxsize=self._maxsize)
+        self._queues.add(q)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        try:
+            while True:
+                item = await q.get()
+                if item is self._END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+
+                yield item
+        finally:
+            self._queues.discard(q)
+            if not self._queues and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+    async def _run(self) -> None:
+        try:
+            async for item in self._source():
+                self._publish(item)
+        except Exception as e:
+            # hand the error to the subscribers, the next one restarts the source
+            self._publish(e)
+        else:
+            self._publish(self._END)
+
+    def _publish(self, item) -> None:
+        for q in self._queues:
+            if q.full():
+                # never block the source on a slow subscriber
+                q.get_nowait()
+                logger.warning("Subscriber too slow, dropping its oldest event")
+            q.put_nowait(item)
+
+
+class _LoopStub:
+    """Proxies a stub whose calls must run on another thread's event loop"""
+
+    def __init__(self, stub: clnrpc.NodeStub, loop: asyncio.AbstractEventLoop):
+        self._stub = stub
+        self._loop = loop
+
+    def __getattr__(self, name: str):
+        method = getattr(self._stub, name)
+
+        def call(request, **kwargs):
+            async def _call():
+                return await method(request, **kwargs)
+
+            fut = asyncio.run_coroutine_threadsafe(_call(), self._loop)
+            return asyncio.wrap_future(fut)
+
+        return call
+
+
+# the message of a CLN RpcError { code: ..., message: "..." } in the error details
+_MESSAGE_RE = re.compile(r'message: "(.*?)" }', re.DOTALL)
+
+
+def _extract_message(details):
+    m = _MESSAGE_RE.search(details)
+    return m.group(1) + "." if m is not None else details
 
-@logger.catch(exclude=(HTTPException,))
-async def _make_local_call(cmd: str):
-    # FIXME: this is a hack because some of the commands are not exposed
-    # in the CLN grpc interface yet.
 
-    testnet = config("network") == "testnet"
-    cmd = f"lightning-cli -k {'--testnet ' if testnet else ''}{cmd}"
-    proc = await asyncio.create_subprocess_shell(
-        cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+def _raise_for_details(details: str, handlers: Tuple) -> None:
+    # Raises the exception of the first handler whose needles are all in details
+    if not details:
+        return
+
+    for needles, make_exc in handlers:
+        if all(n in details for n in needles):
+            raise make_exc(details)
+
+
+def _pay_out_of_routes(details: str) -> HTTPException:
+    attempts = details.split("Ran out of routes to try after ")[1]
+    attempts = attempts.split(" attempts")[0]
+    return HTTPException(
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=f"Ran out of routes to try after {attempts} attempts.",
     )
-    stdout, stderr = await proc.communicate()
 
-    if stderr is not None and stderr != b"":
-        err = stderr.decode()
-        if "lightning-cli: Connecting to 'lightning-rpc': Permission denied" in err:
-            logger.critical(
-                (
-                    "Unable to connect to lightning-cli: Permission denied. "
-                    "Is the lightning-rpc socket readable for the API user?"
-                )
-            )
 
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Unable to connect to lightning-cli: Permission denied.",
-            )
+# (needles, exception factory) pairs, checked in order
+_WITHDRAW_ERROR_HANDLERS = (
+    (
+        ("Could not parse destination address",),
+        lambda d: HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "Could not parse destination address, "
+                " destination should be a valid address."
+            ),
+        ),
+    ),
+    (
+        ("UTXO", "already reserved"),
+        lambda d: HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=(
+                "Server tried to use a reserved UTXO. "
+                "Please submit an issue to the BlitzAPI repository."
+            ),
+        ),
+    ),
+    (
+        ("insufficient funds available",),
+        lambda d: HTTPException(status.HTTP_412_PRECONDITION_FAILED, detail=d),
+    ),
+)
 
-        if "lightning-cli: Moving into" in err and "No such file or directory" in err:
-            logger.critical(
-                (
-                    "Unable to connect to lightning-cli: No such file or directory. "
-                    "Is the lightning-rpc socket available to the API user?"
-                )
-            )
+_PAY_ERROR_HANDLERS = (
+    (("Ran out of routes to try after",), _pay_out_of_routes),
+    (
+        ("Invalid bolt11: ",),
+        lambda d: HTTPException(
+            status.HTTP_400_BAD_REQUEST, detail="invalid bech32 string"
+        ),
+    ),
+    (
+        ("amount_msat parameter required",),
+        lambda d: HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail="amount must be specified when paying a zero amount invoice",
+        ),
+    ),
+    (
+        ("amount_msat parameter unnecessary",),
+        lambda d: HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "amount must not be specified when paying a non-zero amount invoice"
+            ),
+        ),
+    ),
+)
+
+_CONNECT_ERROR_HANDLERS = (
+    (
+        ("All addresses failed",),
+        lambda d: HTTPException(
+            status.HTTP_400_BAD_REQUEST, detail=_extract_message(d)
+        ),
+    ),
+    (
+        ("no address known for peer",),
+        lambda d: HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail="Connection establishment: No address known for peer",
+        ),
+    ),
+    (
+        ("Connection timed out",),
+        lambda d: HTTPException(
+            status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Connection establishment: Connection timed out.",
+        ),
+    ),
+    (
+        ("Connection refused",),
+        lambda d: HTTPException(
+            status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Connection establishment: Connection refused.",
+        ),
+    ),
+)
 
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=(
-                    "Unable to connect to lightning-cli: "
-                    "API Can't access lightning-cli.",
-                ),
-            )
 
-        logger.critical(f"Unable to connect to lightning-cli: {err}")
+def _bad_request_from_message(details: str) -> HTTPException:
+    return HTTPException(status.HTTP_400_BAD_REQUEST, detail=_extract_message(details))
 
-        raise HTTPException(
+
+_FUNDCHANNEL_ERROR_HANDLERS = (
+    (
+        ("amount: should be a satoshi amount",),
+        lambda d: HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail="The amount is not a valid satoshi amount.",
+        ),
+    ),
+    (
+        ("Unknown peer",),
+        lambda d: HTTPException(
             status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=(
-                "Unable to connect to lightning-cli: "
-                "Unknown error. Please consult the logs."
+                "We where able to connect to the peer but CLN "
+                "can't find it when opening a channel."
             ),
-        )
-    return stdout, stderr
+        ),
+    ),
+    (
+        # https://github.com/ElementsProject/lightning/issues/2798#issuecomment-511205719
+        ("Owning subdaemon openingd died",),
+        lambda d: HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "Likely the peer didn't like our channel "
+                "opening proposal and disconnected from us. More info:"
+                "https://github.com/ElementsProject/lightning/issues/2798#issuecomment-511205719"
+            ),
+        ),
+    ),
+    (("Number of pending channels exceed maximum",), _bad_request_from_message),
+    (("exceeds maximum chan size of 10 BTC",), _bad_request_from_message),
+    (("Could not afford all using all ",), _bad_request_from_message),
+    (("BTC is below min chan size of",), _bad_request_from_message),
+)
 
+_CLOSE_ERROR_HANDLERS = (
+    (
+        ("Channel is in state AWAITING_UNILATERAL",),
+        lambda d: HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail="Channel is awaiting an unilateral close.",
+        ),
+    ),
+)
+
+
+def _cln_responding_with_error(details: str) -> HTTPException:
+    logger.error(details)
+    return HTTPException(
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="CLN is responding with an error. Please check the logs.",
+    )
 
-@logger.catch(exclude=(HTTPException,))
-def _extract_message(details):
-    return details.split('message: "')[1].replace('" }', ".")
+
+# errors common to all CLN calls
+_BASE_ERROR_HANDLERS = (
+    (("Received RST_STREAM with error code 8",), _cln_responding_with_error),
+)
 
 
 class LnNodeCLNgRPC(LightningNodeBase):
     _initialized = False
-    _channel = None
-    _cln_stub: clnrpc.NodeStub = None
-    # Decoding the payment request take a long time,
-    # hence we build a simple cache here.
-    _memo_cache = {}
-    _block_cache = {}
+    _channels: List[grpc.aio.Channel] = []
+    _stubs: List[clnrpc.NodeStub] = []
+    _rr = itertools.count()
+    # optional event loop in a separate thread, which handles all gRPC IO
+    _grpc_loop: asyncio.AbstractEventLoop = None
+
+    # Some commands are not exposed in the CLN grpc interface yet,
+    # for those we talk JSON-RPC to the lightning-rpc socket directly.
+    _rpc_path: str = None
+    _rpc_reader: asyncio.StreamReader = None
+    _rpc_read_task: asyncio.Task = None
+    _rpc_writer: asyncio.StreamWriter = None
+    _rpc_lock: asyncio.Lock = None
+    _rpc_pending: dict[int, asyncio.Future] = None
+    _rpc_id: int = 0
+
+    def __init__(self) -> None:
+        # Decoding the payment request take a long time,
+        # hence we build a simple cache here.
+        # Both bolt11 decodes and block times never change,
+        # so we only need to bound the memory usage.
+        self._memo_cache = _LRUCache(maxsize=4096)
+        self._block_cache = _LRUCache(maxsize=1024)
+        self._memo_inflight: dict[str, asyncio.Task] = {}
+
+        # (timestamp, LnInfo), the node info is requested on almost every call
+        # mostly for the block height which changes only every ~10 minutes
+        self._ln_info_cache: Optional[tuple[float, LnInfo]] = None
+        self._ln_info_ttl = config("ln_info_ttl", default=2.0, cast=float)
+
+        # node_pub -> (expiry, alias), aliases are peer metadata and rarely
+        # change. Unknown nodes are cached as None for a shorter time.
+        self._alias_cache = _LRUCache(maxsize=1024)
+        self._alias_ttl = 300.0
+        self._alias_negative_ttl = 60.0
+        self._alias_inflight: dict[bytes, asyncio.Task] = {}
+        # above this many uncached peers one full ListNodes is cheaper than
+        # a ListNodes call per peer
+        self._alias_bulk_threshold = 16
+
+        # all subscribers share one WaitAnyInvoice stream and one forwards poll
+        self._invoice_broadcast = _Broadcaster(self._listen_invoices)
+        self._fwd_broadcast = _Broadcaster(self._listen_forward_events)
 
     def get_implementation_name(self) -> str:
         return "CLN_GRPC"
 
+    def _stub(self) -> clnrpc.NodeStub:
+        # The first stub is reserved for the long-lived WaitAnyInvoice and
+        # ListForwards polling so they don't starve the unary calls.
+        if len(self._stubs) == 1:
+            return self._stubs[0]
+
+        return self._stubs[1 + next(self._rr) % (len(self._stubs) - 1)]
+
+    async def _on_grpc_loop(self, coro):
+        # grpc.aio objects are bound to the loop they are created on
+        if self._grpc_loop is None:
+            return await coro
+
+        fut = asyncio.run_coroutine_threadsafe(coro, self._grpc_loop)
+        return await asyncio.wrap_future(fut)
+
+    async def _open_channels(self, url: str, opts: tuple, pool_size: int) -> None:
+        # a distinct channel arg per channel keeps gRPC from
+        # sharing one subchannel (and HTTP/2 connection) between them
+        self._channels = [
+            grpc.aio.secure_channel(
+                url, self.creds, options=opts + (("grpc.channel_id", i),)
+            )
+            for i in range(pool_size)
+        ]
+        self._stubs = [clnrpc.NodeStub(c) for c in self._channels]
+
+    async def _close_channels(self) -> None:
+        for c in self._channels:
+            await c.close()
+        self._channels = []
+        self._stubs = []
+
     @logger.catch(exclude=(HTTPException,))
     async def initialize(self) -> AsyncGenerator[InitLnRepoUpdate, None]:
         logger.info("Establishing a connection to the CLN daemon ...")
+
+        # every request and response goes through protobuf, the pure Python
+        # implementation is many times slower than upb or cpp
+        if api_implementation.Type() == "python":
+            logger.warning(
+                (
+                    "protobuf is using its pure Python implementation, all CLN "
+                    "calls will be slow. Install a protobuf build with the upb "
+                    "backend and unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION."
+                )
+            )
         if self._initialized:
             logger.warning(
                 (
@@ -149,23 +503,46 @@ class LnNodeCLNgRPC(LightningNodeBase):
         opts = (
             ("grpc.ssl_target_name_override", "cln"),
             ("grpc.max_receive_message_length", 1024 * 1024 * 10),
+            # keep the long lived WaitAnyInvoice stream alive, idle connections
+            # might otherwise be dropped silently by NAT or firewalls
+            ("grpc.keepalive_time_ms", 30000),
+            ("grpc.keepalive_timeout_ms", 10000),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.http2.min_time_between_pings_ms", 10000),
+            ("grpc.http2.min_ping_interval_without_data_ms", 5000),
+            # larger HTTP/2 flow control window for big ListPays/ListInvoices
+            ("grpc.http2.lookahead_bytes", 2 * 1024 * 1024),
         )
 
+        pool_size = max(config("cln_grpc_pool_size", default=4, cast=int), 1)
+
+        if self._grpc_loop is None and config(
+            "cln_grpc_io_thread", default=False, cast=bool
+        ):
+            self._grpc_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=self._grpc_loop.run_forever, name="cln-grpc-io", daemon=True
+            ).start()
+
         while not self._initialized:
             logger.trace("iterating ...")
             try:
-                if self._channel is None:
-                    self._channel = grpc.aio.secure_channel(
-                        cln_grpc_url, self.creds, options=opts
+                if not self._channels:
+                    await self._on_grpc_loop(
+                        self._open_channels(cln_grpc_url, opts, pool_size)
                     )
-                    self._cln_stub = clnrpc.NodeStub(self._channel)
+                    if self._grpc_loop is not None:
+                        self._stubs = [
+                            _LoopStub(s, self._grpc_loop) for s in self._stubs
+                        ]
 
-                await self._cln_stub.Getinfo(ln.GetinfoRequest())
+                await self._stubs[0].Getinfo(_REQ_GET_INFO)
                 self._initialized = True
                 yield InitLnRepoUpdate(state=LnInitState.DONE)
             except grpc.aio._call.AioRpcError as error:
                 details = error.details()
-                logger.debug(f"Waiting for CLN daemon... Details {details}")
+                logger.debug("Waiting for CLN daemon... Details {}", details)
 
                 if "failed to connect to all addresses" in details:
                     yield InitLnRepoUpdate(
@@ -173,8 +550,7 @@ class LnNodeCLNgRPC(LightningNodeBase):
                         msg="Unable to connect to CLN daemon, waiting...",
                     )
 
-                    await self._channel.close()
-                    self._channel = self.cln_stub = None
+                    await self._on_grpc_loop(self._close_channels())
                 else:
                     logger.error(f"Unknown error: {details}")
                     raise
@@ -183,25 +559,45 @@ class LnNodeCLNgRPC(LightningNodeBase):
             except Exception as e:
                 logger.error(f"Unknown error: {e}")
 
+        try:
+            async with self._rpc_get_lock():
+                await self._rpc_connect_if_closed()
+        except OSError as e:
+            # not fatal, _rpc() will retry on the first call
+            logger.warning(f"Unable to connect to the lightning-rpc socket: {e}")
+
         logger.success("Initialization complete.")
 
-    @logger.catch(exclude=(HTTPException,))
     async def get_wallet_balance(self) -> WalletBalance:
         logger.trace("get_wallet_balance() ")
 
-        req = ln.ListfundsRequest()
-        res = await self._cln_stub.ListFunds(req)
-        onchain_confirmed = onchain_unconfirmed = onchain_total = 0
+        try:
+            res = await self._stub().ListFunds(_REQ_LIST_FUNDS)
+        except grpc.aio._call.AioRpcError as error:
+            generic_grpc_error_handler(error)
+
+        # accumulate in msat, WalletBalance wants the onchain values in sat
+        onchain_confirmed_msat = onchain_unconfirmed_msat = 0
+
+        # local names are cheaper to look up than globals inside the loops
+        unconfirmed, confirmed, normal = (
+            _OUTPUT_UNCONFIRMED,
+            _OUTPUT_CONFIRMED,
+            _CHANNEL_NORMAL,
+        )
 
         for o in res.outputs:
-            sat = o.amount_msat.msat / 1000
-            if o.status == 0:  # unconfirmed
-                onchain_unconfirmed += sat
-            elif o.status == 1 and not o.reserved:  # confirmed
-                onchain_confirmed += sat
+            msat = o.amount_msat.msat
+            state = o.status
+            if state == unconfirmed:
+                onchain_unconfirmed_msat += msat
+            elif state == confirmed and not o.reserved:
+                onchain_confirmed_msat += msat
             # 2 is spent => ignore
             # 3 is immature => not sure what to do with this
 
+        onchain_confirmed = onchain_confirmed_msat // 1000
+        onchain_unconfirmed = onchain_unconfirmed_msat // 1000
         onchain_total = onchain_confirmed + onchain_unconfirmed
 
         chan_local = chan_remote = chan_pending_local = chan_pending_remote = 0
@@ -209,7 +605,7 @@ class LnNodeCLNgRPC(LightningNodeBase):
             our_msat = c.our_amount_msat.msat
             their_msat = c.amount_msat.msat - our_msat
 
-            if c.state == 2:  # ChanneldNormal
+            if c.state == normal:
                 chan_local += our_msat
                 chan_remote += their_msat
             else:
@@ -230,24 +626,22 @@ class LnNodeCLNgRPC(LightningNodeBase):
             channel_pending_open_remote_balance=chan_pending_remote,
         )
 
-    @logger.catch(exclude=(HTTPException,))
     async def _get_block_time(self, block_height: int) -> tuple:
-        logger.trace(f"_get_block_time(block_height={block_height}) ")
+        logger.trace("_get_block_time(block_height={}) ", block_height)
 
         if block_height is None or block_height < 0:
             raise ValueError("block_height cannot be None or negative")
 
-        if block_height in self._block_cache:
-            return self._block_cache[block_height]
+        times = self._block_cache.get(block_height)
+        if times is not None:
+            return times
 
-        res = await bitcoin_rpc_async("getblockstats", params=[block_height])
-        hash = res["result"]["blockhash"]
-        block = await bitcoin_rpc_async("getblock", params=[hash])
-        self._block_cache[block_height] = (
-            block["result"]["time"],
-            block["result"]["mediantime"],
+        res = await bitcoin_rpc_async(
+            "getblockstats", params=[block_height, ["time", "mediantime"]]
         )
-        return self._block_cache[block_height]
+        times = (res["result"]["time"], res["result"]["mediantime"])
+        self._block_cache.put(block_height, times)
+        return times
 
     @logger.catch(exclude=(HTTPException,))
     async def list_all_tx(
@@ -255,75 +649,84 @@ class LnNodeCLNgRPC(LightningNodeBase):
     ) -> List[GenericTx]:
         logger.trace(
             (
-                f"list_all_tx(successful_only={successful_only}, "
-                f"index_offset={index_offset}, max_tx={max_tx}, reversed={reversed})"
-            )
+                "list_all_tx(successful_only={}, "
+                "index_offset={}, max_tx={}, reversed={})"
+            ),
+            successful_only,
+            index_offset,
+            max_tx,
+            reversed,
         )
 
-        list_invoice_req = ln.ListinvoicesRequest()
-        list_payments_req = ln.ListpaysRequest()
-
         try:
             res = await asyncio.gather(
                 *[
-                    self._cln_stub.ListInvoices(list_invoice_req),
+                    self._stub().ListInvoices(_REQ_LIST_INVOICES),
                     self.list_on_chain_tx(),
-                    self._cln_stub.ListPays(list_payments_req),
-                    self.get_ln_info(),
+                    self._stub().ListPays(_REQ_LIST_PAYS),
+                    self.get_block_height(),
                 ]
             )
-            tx = []
-            for invoice in res[0].invoices:
-                i = GenericTx.from_cln_grpc_invoice(invoice)
-                if successful_only and i.status == TxStatus.SUCCEEDED:
-                    tx.append(i)
-                    continue
-                tx.append(i)
-
-            for transaction in res[1]:
-                t = GenericTx.from_onchain_tx(transaction, res[3].block_height)
-                if successful_only and t.status == TxStatus.SUCCEEDED:
-                    tx.append(t)
-                    continue
-
-                tx.append(t)
-
-            for pay in res[2].pays:
-                decoded_bolt11: PaymentRequest = None
-
-                if pay.bolt11 is not None and len(pay.bolt11) > 0:
-                    if pay.bolt11 in self._memo_cache:
-                        decoded_bolt11 = self._memo_cache[pay.bolt11]
-                    else:
-                        decoded_bolt11 = await self.decode_pay_request(pay.bolt11)
-                        self._memo_cache[pay.bolt11] = decoded_bolt11
-
-                p = GenericTx.from_cln_grpc_payment(
-                    pay, decoded_bolt11.description, decoded_bolt11.num_msat
-                )
+            block_height = res[3]
+            decoded = {}
 
-                if successful_only and p.status == TxStatus.SUCCEEDED:
-                    tx.append(p)
-                    continue
+            def invoice_to_tx(invoice) -> GenericTx:
+                return GenericTx.from_cln_grpc_invoice(invoice)
 
-                tx.append(p)
+            def onchain_to_tx(tx) -> GenericTx:
+                return GenericTx.from_onchain_tx(tx, block_height)
 
-            def sortKey(e: GenericTx):
-                return e.time_stamp
-
-            tx.sort(key=sortKey)
+            def pay_to_tx(pay) -> GenericTx:
+                decoded_bolt11: PaymentRequest = decoded.get(pay.bolt11)
+                return GenericTx.from_cln_grpc_payment(
+                    pay, decoded_bolt11.description, decoded_bolt11.num_msat
+                )
 
+            # Sort and filter on the raw values, the same way the GenericTx
+            # constructors derive time_stamp and status. This way only the
+            # requested page is turned into models and only its bolt11s are
+            # decoded.
+            entries = []
+            for i in res[0].invoices:
+                paid = i.status == _INVOICE_PAID
+                if paid or not successful_only:
+                    ts = i.paid_at if paid else i.expires_at
+                    entries.append((ts, invoice_to_tx, i))
+            for t in res[1]:
+                if not successful_only or block_height > t.block_height:
+                    entries.append((0, onchain_to_tx, t))
+            for p in res[2].pays:
+                if not successful_only or p.status == _PAY_COMPLETE:
+                    entries.append((p.created_at, pay_to_tx, p))
+
+            # sort ascending before reversing (not sort(reverse=True)) so equal
+            # timestamps, e.g. all on-chain txs, keep the original order
+            entries.sort(key=itemgetter(0))
             if reversed:
-                tx.reverse()
-
-            tx_length = len(tx)
-            for invoice in range(tx_length):
-                tx[invoice].index = invoice
+                entries.reverse()
 
             if max_tx == 0:
-                max_tx = tx_length
+                max_tx = len(entries)
+
+            page = entries[index_offset : index_offset + max_tx]
 
-            return tx[index_offset : index_offset + max_tx]
+            bolt11s = list(
+                {
+                    raw.bolt11
+                    for _, to_tx, raw in page
+                    if to_tx is pay_to_tx and raw.bolt11
+                }
+            )
+            results = await asyncio.gather(
+                *[self.decode_pay_request(b) for b in bolt11s]
+            )
+            decoded.update(zip(bolt11s, results))
+
+            txs = [to_tx(raw) for _, to_tx, raw in page]
+            for index, t in enumerate(txs, start=index_offset):
+                t.index = index
+
+            return txs
         except grpc.aio._call.AioRpcError as error:
             generic_grpc_error_handler(error)
 
@@ -338,24 +741,20 @@ class LnNodeCLNgRPC(LightningNodeBase):
         logger.trace("list_invoices() ")
 
         try:
-            req = ln.ListinvoicesRequest()
-            res = await self._cln_stub.ListInvoices(req)
-
-            tx = []
-            for i in res.invoices:
-                if pending_only:
-                    if i.status == 0:
-                        tx.append(Invoice.from_cln_grpc(i))
-                else:
-                    tx.append(Invoice.from_cln_grpc(i))
+            res = await self._stub().ListInvoices(_REQ_LIST_INVOICES)
 
-            if reversed:
-                tx.reverse()
+            # CLN can't paginate here, so at least only build
+            # the models for the requested page
+            invoices = res.invoices[::-1] if reversed else res.invoices
+            if pending_only:
+                invoices = (i for i in invoices if i.status == _INVOICE_UNPAID)
 
-            if num_max_invoices == 0 or num_max_invoices is None:
-                return tx
+            if num_max_invoices:
+                invoices = itertools.islice(
+                    invoices, index_offset, index_offset + num_max_invoices
+                )
 
-            return tx[index_offset : index_offset + num_max_invoices]
+            return [Invoice.from_cln_grpc(i) for i in invoices]
 
         except grpc.aio._call.AioRpcError as error:
             generic_grpc_error_handler(error)
@@ -363,69 +762,53 @@ class LnNodeCLNgRPC(LightningNodeBase):
     @logger.catch(exclude=(HTTPException,))
     async def list_on_chain_tx(self) -> List[OnChainTransaction]:
         logger.trace("list_on_chain_tx() ")
-        info = await self.get_ln_info()  # for current block height
-        res = await _make_local_call("bkpr-listincome")
+        block_height, income, events = await asyncio.gather(
+            self.get_block_height(),
+            self._rpc("bkpr-listincome"),
+            self._rpc("bkpr-listaccountevents"),
+        )
 
-        if not res:
+        if "error" in income:
             raise HTTPException(
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Unknown CLN error while listing account income events",
+                detail=(
+                    "Unknown CLN error while listing account income events: "
+                    f"{income['error']}"
+                ),
             )
 
-        if len(res) == 0:
+        if "error" in events:
             raise HTTPException(
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=(
-                    "No response from CLN while trying to list account income events"
+                    f"Unknown CLN error while listing account events: {events['error']}"
                 ),
             )
 
-        decoded = res[0].decode()
-        js = json.loads(decoded)
-
         txs = {}
-        num_events = len(js["income_events"])
-        for i in range(0, num_events):
-            e = js["income_events"][i]
+        for e in income["result"]["income_events"]:
             if e["account"] != "wallet":
                 continue
 
-            if e["tag"] == "deposit" or e["tag"] == "withdrawal":
+            if e["tag"] == _TAG_DEPOSIT or e["tag"] == _TAG_WITHDRAWAL:
                 tx = OnChainTransaction.from_cln_bkpr(e)
                 txs[tx.tx_hash] = tx
-            elif e["tag"] == "onchain_fee":
+            elif e["tag"] == _TAG_ONCHAIN_FEE:
                 if e["txid"] in txs:
-                    txs[e["txid"]].total_fees = parse_cln_msat(e["debit_msat"]) / 1000
+                    txs[e["txid"]].total_fees = parse_cln_msat(e["debit_msat"]) // 1000
 
         # TODO: Improve this once CLN reports the block height in bkpr-listincome
         # see https://github.com/ElementsProject/lightning/issues/5694
 
         # now get the block height for each tx ...
-        res = await _make_local_call("bkpr-listaccountevents")
-        if not res:
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Unknown CLN error while listing account events",
-            )
-
-        if len(res) == 0:
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="No response from CLN while trying to list account events",
-            )
-
-        decoded = res[0].decode()
-        js = json.loads(decoded)
-        num_events = len(js["events"])
-        for i in range(0, num_events):
-            e = js["events"][i]
+        for e in events["result"]["events"]:
             if e["account"] != "wallet" or e["type"] != "chain":
                 continue
 
             txid = ""
-            if e["tag"] == "deposit":
+            if e["tag"] == _TAG_DEPOSIT:
                 txid = e["outpoint"].split(":")[0]
-            elif e["tag"] == "withdrawal":
+            elif e["tag"] == _TAG_WITHDRAWAL:
                 txid = e["txid"]
 
             if len(txid) == 0:
@@ -433,9 +816,9 @@ class LnNodeCLNgRPC(LightningNodeBase):
 
             if txid in txs:
                 txs[txid].block_height = e["blockheight"]
-                txs[txid].num_confirmations = info.block_height - txs[txid].block_height
+                txs[txid].num_confirmations = block_height - txs[txid].block_height
 
-        return [txs[k] for k in txs.keys()]
+        return list(txs.values())
 
     @logger.catch(exclude=(HTTPException,))
     async def list_payments(
@@ -447,32 +830,26 @@ class LnNodeCLNgRPC(LightningNodeBase):
     ):
         logger.trace(
             (
-                f"list_payments(include_incomplete={include_incomplete}, "
-                f"index_offset{index_offset}, max_payments={max_payments}, "
-                f"reversed={reversed})"
-            )
+                "list_payments(include_incomplete={}, "
+                "index_offset={}, max_payments={}, reversed={})"
+            ),
+            include_incomplete,
+            index_offset,
+            max_payments,
+            reversed,
         )
         try:
-            req = ln.ListpaysRequest()
-            res = await self._cln_stub.ListPays(req)
-
-            pays = []
-            for p in res.pays:
-                if p.status == 2:
-                    # always include completed payments
-                    pays.append(Payment.from_cln_grpc(p))
-                    continue
+            res = await self._stub().ListPays(_REQ_LIST_PAYS)
 
-                if include_incomplete:
-                    pays.append(Payment.from_cln_grpc(p))
+            pays = res.pays[::-1] if reversed else res.pays
+            if not include_incomplete:
+                # always include completed payments
+                pays = (p for p in pays if p.status == _PAY_COMPLETE)
 
-            if reversed:
-                pays.reverse()
+            if max_payments:
+                pays = itertools.islice(pays, index_offset, index_offset + max_payments)
 
-            if max_payments == 0 or max_payments is None:
-                return pays
-
-            return pays[index_offset : index_offset + max_payments]
+            return [Payment.from_cln_grpc(p) for p in pays]
         except grpc.aio._call.AioRpcError as error:
             generic_grpc_error_handler(error)
 
@@ -485,10 +862,11 @@ class LnNodeCLNgRPC(LightningNodeBase):
         is_keysend: bool = False,
     ) -> Invoice:
         logger.trace(
-            (
-                f"add_invoice(value_msat={value_msat}, memo={memo}, "
-                f"expiry={expiry}, is_keysend={is_keysend})"
-            )
+            "add_invoice(value_msat={}, memo={}, expiry={}, is_keysend={})",
+            value_msat,
+            memo,
+            expiry,
+            is_keysend,
         )
 
         if value_msat < 0:
@@ -509,7 +887,7 @@ class LnNodeCLNgRPC(LightningNodeBase):
         )
 
         try:
-            res = await self._cln_stub.Invoice(req)
+            res = await self._stub().Invoice(req)
             return Invoice(
                 payment_request=res.bolt11,
                 memo=memo,
@@ -534,39 +912,45 @@ class LnNodeCLNgRPC(LightningNodeBase):
 
     @logger.catch(exclude=(HTTPException,))
     async def decode_pay_request(self, pay_req: str) -> PaymentRequest:
-        logger.trace(f"decode_pay_request(pay_req={pay_req})")
+        logger.trace("decode_pay_request(pay_req={})", pay_req)
 
-        res = await _make_local_call(f"decodepay bolt11={pay_req}")
+        pr = self._memo_cache.get(pay_req)
+        if pr is not None:
+            return pr
 
-        if not res:
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Unknown CLN error decoding pay request",
-            )
+        # concurrent callers decoding the same bolt11 share a single request
+        task = self._memo_inflight.get(pay_req)
+        if task is None:
+            task = asyncio.create_task(self._decode_pay_request(pay_req))
+            task.add_done_callback(lambda _: self._memo_inflight.pop(pay_req, None))
+            self._memo_inflight[pay_req] = task
 
-        if len(res) == 0:
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="No response from CLN decoding pay request",
-            )
+        pr = await asyncio.shield(task)
+        self._memo_cache.put(pay_req, pr)
+        return pr
+
+    async def _decode_pay_request(self, pay_req: str) -> PaymentRequest:
+        res = await self._rpc("decodepay", bolt11=pay_req)
 
-        decoded = res[0].decode()
+        if "error" in res:
+            message = res["error"].get("message", "")
+            if "Invalid bolt11: Bad bech32 string" in message:
+                raise HTTPException(
+                    status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid bolt11: Bad bech32 string",
+                )
 
-        if "Invalid bolt11: Bad bech32 string" in decoded:
             raise HTTPException(
-                status.HTTP_400_BAD_REQUEST,
-                detail="Invalid bolt11: Bad bech32 string",
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Unknown CLN error decoding pay request: {message}",
             )
 
-        return PaymentRequest.from_cln_json(json.loads(decoded))
+        return PaymentRequest.from_cln_json(res["result"])
 
-    @logger.catch(exclude=(HTTPException,))
     async def get_fee_revenue(self) -> FeeRevenue:
         logger.trace("get_fee_revenue()")
         try:
-            # status 1 == "settled"
-            req = ln.ListforwardsRequest(status=1)
-            res = await self._cln_stub.ListForwards(req)
+            res = await self._stub().ListForwards(_REQ_LIST_FORWARDS_SETTLED)
             day, week, month, year, total = cln_classify_fee_revenue(res.forwards)
 
             return FeeRevenue(day=day, week=week, month=month, year=year, total=total)
@@ -575,13 +959,11 @@ class LnNodeCLNgRPC(LightningNodeBase):
                 status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error.details()
             )
 
-    @logger.catch(exclude=(HTTPException,))
     async def new_address(self, input: NewAddressInput) -> str:
-        logger.trace(f"new_address(input={input})")
+        logger.trace("new_address(input={})", input)
 
         try:
-            req = ln.NewaddrRequest()
-            res = await self._cln_stub.NewAddr(req)
+            res = await self._stub().NewAddr(_REQ_NEW_ADDR)
 
             return res.bech32
         except grpc.aio._call.AioRpcError as error:
@@ -589,26 +971,22 @@ class LnNodeCLNgRPC(LightningNodeBase):
                 status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(error)
             )
 
-            return res.bech32
-        except grpc.aio._call.AioRpcError as error:
-            generic_grpc_error_handler(error)
-
     @logger.catch(exclude=(HTTPException,))
     async def send_coins(self, input: SendCoinsInput) -> SendCoinsResponse:
-        logger.trace(f"send_coins(input={input})")
+        logger.trace("send_coins(input={})", input)
 
         fee_rate: lnp.Feerate = None
         if input.sat_per_vbyte is not None and input.sat_per_vbyte > 0:
             fee_rate = lnp.Feerate(perkw=input.sat_per_vbyte)
         elif input.target_conf is not None and input.target_conf == 1:
-            fee_rate = lnp.Feerate(urgent=True)
+            fee_rate = _FEERATE_URGENT
         elif input.target_conf is not None and input.target_conf >= 2:
-            fee_rate = lnp.Feerate(normal=True)
+            fee_rate = _FEERATE_NORMAL
         elif input.target_conf is not None and input.target_conf >= 10:
-            fee_rate = lnp.Feerate(slow=True)
+            fee_rate = _FEERATE_SLOW
 
         try:
-            funds = await self._cln_stub.ListFunds(ln.ListfundsRequest())
+            funds = await self._stub().ListFunds(_REQ_LIST_FUNDS)
             if len(funds.outputs) == 0:
                 raise HTTPException(
                     status.HTTP_412_PRECONDITION_FAILED,
@@ -618,12 +996,12 @@ class LnNodeCLNgRPC(LightningNodeBase):
                 )
 
             utxos = []
-            max_amt = 0
+            max_amt_msat = 0
             for o in funds.outputs:
                 utxos.append(lnp.Outpoint(txid=o.txid, outnum=o.output))
-                max_amt += o.amount_msat.msat / 1000
+                max_amt_msat += o.amount_msat.msat
 
-            if not input.send_all and max_amt <= input.amount:
+            if not input.send_all and max_amt_msat <= input.amount * 1000:
                 raise HTTPException(
                     status.HTTP_412_PRECONDITION_FAILED,
                     detail=(
@@ -645,7 +1023,7 @@ class LnNodeCLNgRPC(LightningNodeBase):
                 feerate=fee_rate,
                 utxos=utxos,
             )
-            response = await self._cln_stub.Withdraw(req)
+            response = await self._stub().Withdraw(req)
             r = SendCoinsResponse.from_cln_grpc(response, input)
             await broadcast_sse_msg(SSE.LN_ONCHAIN_PAYMENT_STATUS, r.dict())
             return r
@@ -653,30 +1031,8 @@ class LnNodeCLNgRPC(LightningNodeBase):
             details = error.details()
             logger.debug(details)
 
-            if details and details.find("Could not parse destination address") > -1:
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    detail=(
-                        "Could not parse destination address, "
-                        " destination should be a valid address."
-                    ),
-                )
-            elif (
-                details
-                and details.find("UTXO") > -1
-                and details.find("already reserved") > -1
-            ):
-                raise HTTPException(
-                    status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=(
-                        "Server tried to use a reserved UTXO. "
-                        "Please submit an issue to the BlitzAPI repository."
-                    ),
-                )
-            elif details and details.find("insufficient funds available") > -1:
-                raise HTTPException(status.HTTP_412_PRECONDITION_FAILED, detail=details)
-            else:
-                generic_grpc_error_handler(error)
+            _raise_for_details(details, _WITHDRAW_ERROR_HANDLERS)
+            generic_grpc_error_handler(error)
 
     @logger.catch(exclude=(HTTPException,))
     async def send_payment(
@@ -688,9 +1044,13 @@ class LnNodeCLNgRPC(LightningNodeBase):
     ) -> Payment:
         logger.trace(
             (
-                f"send_payment(pay_req={pay_req}, timeout_seconds={timeout_seconds}, "
-                f"fee_limit_msat={fee_limit_msat}, amount_msat={amount_msat})"
-            )
+                "send_payment(pay_req={}, timeout_seconds={}, "
+                "fee_limit_msat={}, amount_msat={})"
+            ),
+            pay_req,
+            timeout_seconds,
+            fee_limit_msat,
+            amount_msat,
         )
 
         amt = lnp.Amount(msat=amount_msat) if amount_msat is not None else None
@@ -703,55 +1063,35 @@ class LnNodeCLNgRPC(LightningNodeBase):
         )
 
         try:
-            res = await self._cln_stub.Pay(req)
+            res = await self._stub().Pay(req)
         except grpc.aio._call.AioRpcError as error:
             details = error.details()
             logger.debug(details)
 
-            if "Ran out of routes to try after" in details:
-                attempts = details.split("Ran out of routes to try after ")[1]
-                attempts = attempts.split(" attempts")[0]
-                raise HTTPException(
-                    status.HTTP_422_UNPROCESSABLE_ENTITY,
-                    detail=f"Ran out of routes to try after {attempts} attempts.",
-                )
-
-            if "Invalid bolt11: " in details:
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    detail="invalid bech32 string",
-                )
-
-            if "amount_msat parameter required" in details:
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    detail="amount must be specified when paying a zero amount invoice",
-                )
-
-            if "amount_msat parameter unnecessary" in details:
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    detail=(
-                        (
-                            "amount must not be specified when paying "
-                            "a non-zero amount invoice"
-                        )
-                    ),
-                )
-
+            _raise_for_details(details, _PAY_ERROR_HANDLERS)
             generic_grpc_error_handler(error)
 
         return Payment.from_cln_grpc(res)
 
-    @logger.catch(exclude=(HTTPException,))
     async def get_ln_info(self) -> LnInfo:
         logger.trace("get_ln_info()")
 
-        req = ln.GetinfoRequest()
+        now = time.monotonic()
+        if (
+            self._ln_info_cache is not None
+            and now - self._ln_info_cache[0] < self._ln_info_ttl
+        ):
+            # hand out copies, callers such as service.get_ln_info() set
+            # fields on the result and must not touch the cached instance
+            return self._ln_info_cache[1].copy()
+
         try:
-            res = await self._cln_stub.Getinfo(req)
-            return LnInfo.from_cln_grpc(self.get_implementation_name(), res)
+            res = await self._stub().Getinfo(_REQ_GET_INFO)
+            info = LnInfo.from_cln_grpc(self.get_implementation_name(), res)
+            self._ln_info_cache = (now, info)
+            return info.copy()
         except grpc.aio._call.AioRpcError as error:
+            self._ln_info_cache = None
             details = error.details()
             logger.debug(details)
 
@@ -765,6 +1105,10 @@ class LnNodeCLNgRPC(LightningNodeBase):
                 detail=f"Unknown CLN error while getting lightning info: {details}",
             )
 
+    async def get_block_height(self) -> int:
+        info = await self.get_ln_info()
+        return info.block_height
+
     @logger.catch(exclude=(HTTPException,))
     async def unlock_wallet(self, password: str) -> bool:
         logger.trace("unlock_wallet(password=wedontlogpasswords)")
@@ -773,25 +1117,26 @@ class LnNodeCLNgRPC(LightningNodeBase):
         # so we don't need to do anything here
         return True
 
-    @logger.catch(exclude=(HTTPException,))
     async def listen_invoices(self) -> AsyncGenerator[Invoice, None]:
         logger.trace("listen_invoices()")
+
+        async for i in self._invoice_broadcast.subscribe():
+            yield i
+
+    @logger.catch(exclude=(HTTPException,))
+    async def _listen_invoices(self) -> AsyncGenerator[Invoice, None]:
         try:
-            lastpay_index = 0
-            invoices = await self.list_invoices(
-                pending_only=False,
-                index_offset=0,
-                num_max_invoices=9999999999999,
-                reversed=False,
+            # only the highest pay_index is of interest here,
+            # read it straight from the protobuf instead of building Invoice models
+            res = await self._stub().ListInvoices(_REQ_LIST_INVOICES)
+            lastpay_index = max(
+                (i.pay_index for i in res.invoices if i.status == _INVOICE_PAID),
+                default=0,
             )
 
-            for i in invoices:  # type Invoice
-                if i.state == InvoiceState.SETTLED and i.settle_index > lastpay_index:
-                    lastpay_index = i.settle_index
-
             while True:
                 req = ln.WaitanyinvoiceRequest(lastpay_index=lastpay_index)
-                i = await self._cln_stub.WaitAnyInvoice(req)
+                i = await self._stubs[0].WaitAnyInvoice(req)
                 i = Invoice.from_cln_grpc(i)
                 lastpay_index = i.settle_index
                 yield i
@@ -809,23 +1154,74 @@ class LnNodeCLNgRPC(LightningNodeBase):
                 detail=f"Unknown CLN error while listening for invoices: {details}",
             )
 
-    @logger.catch(exclude=(HTTPException,))
     async def listen_forward_events(self) -> ForwardSuccessEvent:
         logger.trace("listen_forward_events()")
 
+        async for fwd in self._fwd_broadcast.subscribe():
+            yield fwd
+
+    @logger.catch(exclude=(HTTPException,))
+    async def _listen_forward_events(self) -> ForwardSuccessEvent:
         # CLN has no subscription to forwarded events.
         # We must poll instead.
 
         interval = config("gather_ln_info_interval", default=2, cast=float)
 
+        # Newer CLN versions keep an index that is bumped whenever a forward
+        # changes. Polling listforwards from the last seen index only returns
+        # the forwards settled since the previous poll instead of the whole
+        # history. The gRPC interface doesn't expose the index yet.
+        start = await self._forwards_next_updated_index()
+        if start is None:
+            async for fwd in self._poll_all_forwards(interval):
+                yield fwd
+            return
+
+        while True:
+            res = await self._rpc(
+                "listforwards", status="settled", index="updated", start=start
+            )
+            if "error" in res:
+                raise HTTPException(
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Unknown CLN error while listing forwards: {res['error']}",
+                )
+
+            for fwd in res["result"]["forwards"]:
+                start = max(start, fwd.get("updated_index", 0) + 1)
+                yield ForwardSuccessEvent.from_cln_rpc(fwd)
+
+            await asyncio.sleep(interval - 0.1)
+
+    async def _forwards_next_updated_index(self) -> Optional[int]:
+        # Returns None if CLN doesn't support indexed listforwards
+        try:
+            res = await self._rpc(
+                "listforwards", status="settled", index="updated", start=0
+            )
+        except HTTPException:
+            return None
+
+        if "error" in res:
+            logger.debug(
+                "Indexed listforwards not supported, falling back to polling "
+                "all forwards: {}",
+                res["error"],
+            )
+            return None
+
+        return max(
+            (f.get("updated_index", 0) + 1 for f in res["result"]["forwards"]),
+            default=0,
+        )
+
+    async def _poll_all_forwards(self, interval: float) -> ForwardSuccessEvent:
         # make sure we know how many forwards we have
         # we need to calculate the difference between each iteration
-        # status=1 == "settled"
-        req = ln.ListforwardsRequest(status=1)
-        res = await self._cln_stub.ListForwards(req)
+        res = await self._stubs[0].ListForwards(_REQ_LIST_FORWARDS_SETTLED)
         num_fwd_last_poll = len(res.forwards)
         while True:
-            res = await self._cln_stub.ListForwards(req)
+            res = await self._stubs[0].ListForwards(_REQ_LIST_FORWARDS_SETTLED)
             if len(res.forwards) > num_fwd_last_poll:
                 fwds = res.forwards[num_fwd_last_poll:]
                 for fwd in fwds:
@@ -836,165 +1232,187 @@ class LnNodeCLNgRPC(LightningNodeBase):
 
     @logger.catch(exclude=(HTTPException,))
     async def connect_peer(self, uri: str) -> bool:
-        logger.trace(f"connect_peer(node_URI={uri})")
+        logger.trace("connect_peer(node_URI={})", uri)
 
         try:
             req = ln.ConnectRequest(id=uri)
-            await self._cln_stub.ConnectPeer(req)
+            await self._stub().ConnectPeer(req)
 
             return True
         except grpc.aio._call.AioRpcError as error:
             details = error.details()
             logger.warning(details)
 
-            if "All addresses failed" in details:
-                m = details.split('message: "')[1]
+            _raise_for_details(details, _CONNECT_ERROR_HANDLERS)
 
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    detail=m,
-                )
+            logger.exception(details)
 
-            if "no address known for peer" in details:
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    detail="Connection establishment: No address known for peer",
-                )
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=details)
 
-            if "Connection timed out" in details:
-                raise HTTPException(
-                    status.HTTP_504_GATEWAY_TIMEOUT,
-                    detail="Connection establishment: Connection timed out.",
-                )
+    async def peer_resolve_alias(self, node_pub: bytes) -> str:
+        logger.opt(lazy=True).trace(
+            "peer_resolve_alias(node_pub={})", lambda: node_pub.hex()
+        )
 
-            if "Connection refused" in details:
-                raise HTTPException(
-                    status.HTTP_504_GATEWAY_TIMEOUT,
-                    detail="Connection establishment: Connection refused.",
-                )
+        hit = self._alias_cache.get(node_pub)
+        if hit is not None and time.monotonic() < hit[0]:
+            if hit[1] is None:
+                raise NodeNotFoundError(node_pub.hex())
 
-            logger.exception(details)
+            return hit[1]
 
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error.details()
-            )
+        # concurrent callers resolving the same node share a single request
+        task = self._alias_inflight.get(node_pub)
+        if task is None:
+            task = asyncio.create_task(self._peer_resolve_alias(node_pub))
+            task.add_done_callback(lambda _: self._alias_inflight.pop(node_pub, None))
+            self._alias_inflight[node_pub] = task
 
-    @logger.catch(exclude=(HTTPException, NodeNotFoundError))
-    async def peer_resolve_alias(self, node_pub: bytes) -> str:
-        logger.trace(f"peer_resolve_alias(node_pub={node_pub})")
+        return await asyncio.shield(task)
 
+    async def _peer_resolve_alias(self, node_pub: bytes) -> str:
         try:
             request = ln.ListnodesRequest(id=node_pub)
-            response = await self._cln_stub.ListNodes(request)
+            response = await self._stub().ListNodes(request)
 
-            if len(response.nodes) == 0:
+            if not response.nodes:
+                expiry = time.monotonic() + self._alias_negative_ttl
+                self._alias_cache.put(node_pub, (expiry, None))
                 raise NodeNotFoundError(node_pub.hex())
 
-            return str(response.nodes[0].alias)
+            alias = response.nodes[0].alias
+            self._alias_cache.put(node_pub, (time.monotonic() + self._alias_ttl, alias))
+            return alias
 
         except grpc.aio._call.AioRpcError as error:
-            logger.error(error.details())
+            details = error.details()
+            logger.error(details)
 
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error.details()
-            )
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=details)
 
     @logger.catch(exclude=(HTTPException,))
     async def channel_open(
         self, local_funding_amount: int, node_URI: str, target_confs: int
     ) -> str:
         logger.trace(
-            (
-                f"channel_open(local_funding_amount={local_funding_amount}, "
-                f"node_URI={node_URI}, target_confs={target_confs})"
-            )
+            "channel_open(local_funding_amount={}, node_URI={}, target_confs={})",
+            local_funding_amount,
+            node_URI,
+            target_confs,
         )
 
         await self.connect_peer(node_URI)
 
-        fee_rate: lnp.Feerate = None
-        if target_confs == 1:
-            fee_rate = lnp.Feerate(urgent=True)
-        elif target_confs >= 2 and target_confs <= 9:
-            fee_rate = lnp.Feerate(normal=True)
-        elif target_confs >= 10:
-            fee_rate = lnp.Feerate(slow=True)
+        fee_rate = _FEERATE_BY_CONFS[min(max(target_confs, 0), 10)]
 
         try:
-            h = bytes.fromhex(node_URI.split("@")[0])
-            req = ln.FundchannelRequest(
-                id=h,
-                amount=lnp.AmountOrAll(amount=lnp.Amount(msat=local_funding_amount)),
-                feerate=fee_rate,
-            )
+            h = bytes.fromhex(node_URI.partition("@")[0])
+            req = ln.FundchannelRequest()
+            req.CopyFrom(_FUNDCHANNEL_TEMPLATE)
+            req.id = h
+            req.amount.amount.msat = local_funding_amount
+            if fee_rate is not None:
+                req.feerate.CopyFrom(fee_rate)
         except TypeError as e:
             logger.error(f"channel_open() failed at ln.FundchannelRequest(): {e}")
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
         try:
-            res = await self._cln_stub.FundChannel(req)
+            res = await self._stub().FundChannel(req)
             return res.txid.hex()
 
         except grpc.aio._call.AioRpcError as error:
             details = error.details()
             logger.debug(details)
 
-            if "amount: should be a satoshi amount" in details:
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    detail="The amount is not a valid satoshi amount.",
-                )
+            _raise_for_details(details, _FUNDCHANNEL_ERROR_HANDLERS)
 
-            if "Unknown peer" in details:
-                raise HTTPException(
-                    status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=(
-                        "We where able to connect to the peer but CLN "
-                        "can't find it when opening a channel."
-                    ),
-                )
+            logger.warning(f"UNHANDLED ERROR: {details}")
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=details)
 
-            if "Owning subdaemon openingd died" in details:
-                # https://github.com/ElementsProject/lightning/issues/2798#issuecomment-511205719
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    detail=(
-                        "Likely the peer didn't like our channel "
-                        "opening proposal and disconnected from us. More info:"
-                        "https://github.com/ElementsProject/lightning/issues/2798#issuecomment-511205719"
-                    ),
-                )
+    async def _resolve_aliases_bulk(self, pubs: List[bytes]) -> None:
+        # Fills the alias cache for the given pubkeys with a single ListNodes
+        # call. Peers that are still missing are resolved one by one later.
+        now = time.monotonic()
+        uncached = set()
+        for p in pubs:
+            hit = self._alias_cache.get(p)
+            if p and (hit is None or now >= hit[0]):
+                uncached.add(p)
 
-            if (
-                "Number of pending channels exceed maximum" in details
-                or "exceeds maximum chan size of 10 BTC" in details
-                or "Could not afford all using all " in details
-                or "BTC is below min chan size of" in details
-            ):
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST, detail=_extract_message(details)
-                )
+        if len(uncached) < self._alias_bulk_threshold:
+            return
 
-            logger.warning(f"UNHANDLED ERROR: {details}")
-            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=details)
+        try:
+            response = await self._stub().ListNodes(ln.ListnodesRequest())
+        except grpc.aio._call.AioRpcError as error:
+            logger.warning(
+                "Bulk alias lookup failed, resolving one by one: {}", error.details()
+            )
+            return
+
+        expiry = time.monotonic() + self._alias_ttl
+        for n in response.nodes:
+            if n.nodeid in uncached:
+                self._alias_cache.put(n.nodeid, (expiry, n.alias))
+
+    async def _peer_alias(self, peer_id: bytes) -> str:
+        # a failed alias lookup must not fail a whole channel list
+        try:
+            return await alias_or_empty(self.peer_resolve_alias, peer_id)
+        except Exception as e:
+            logger.warning(f"Unable to resolve alias for peer {peer_id.hex()}: {e}")
+            return ""
+
+    async def channel_list_stream(self) -> AsyncGenerator[Channel, None]:
+        logger.trace("channel_list_stream()")
+
+        try:
+            res = await self._stub().ListFunds(_REQ_LIST_FUNDS)
+        except grpc.aio._call.AioRpcError as error:
+            raise HTTPException(
+                status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error.details()
+            )
+
+        by_peer: dict[bytes, list] = {}
+        for c in res.channels:
+            by_peer.setdefault(c.peer_id, []).append(c)
+
+        await self._resolve_aliases_bulk(list(by_peer))
+
+        async def _resolve(peer_id: bytes) -> tuple:
+            return peer_id, await self._peer_alias(peer_id)
+
+        # yield the channels of each peer as soon as its alias is known
+        tasks = [asyncio.ensure_future(_resolve(p)) for p in by_peer]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                peer_id, alias = await next_done
+                for c in by_peer[peer_id]:
+                    yield Channel.from_cln_grpc(c, alias)
+        finally:
+            for t in tasks:
+                t.cancel()
 
-    @logger.catch(exclude=(HTTPException,))
     async def channel_list(self) -> List[Channel]:
         logger.trace("channel_list()")
 
         try:
-            res = await self._cln_stub.ListFunds(ln.ListfundsRequest())
-            peer_ids = [c.peer_id for c in res.channels]
-            peer_res = await asyncio.gather(
-                *[alias_or_empty(self.peer_resolve_alias, p) for p in peer_ids],
-                return_exceptions=True,
-            )
+            res = await self._stub().ListFunds(_REQ_LIST_FUNDS)
+            # several channels to the same peer need only one lookup
+            peer_ids = list(dict.fromkeys(c.peer_id for c in res.channels))
+            await self._resolve_aliases_bulk(peer_ids)
+            aliases = [""] * len(peer_ids)
+
+            async def _fill(i: int, peer_id: bytes) -> None:
+                aliases[i] = await self._peer_alias(peer_id)
 
-            channels = []
-            for c, p in zip(res.channels, peer_res):
-                channels.append(Channel.from_cln_grpc(c, p))
+            await asyncio.gather(*map(_fill, range(len(peer_ids)), peer_ids))
+            alias_map = dict(zip(peer_ids, aliases))
 
-            return channels
+            return [
+                Channel.from_cln_grpc(c, alias_map[c.peer_id]) for c in res.channels
+            ]
         except grpc.aio._call.AioRpcError as error:
             raise HTTPException(
                 status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error.details()
@@ -1003,7 +1421,7 @@ class LnNodeCLNgRPC(LightningNodeBase):
     @logger.catch(exclude=(HTTPException,))
     async def channel_close(self, channel_id: int, force_close: bool) -> str:
         logger.trace(
-            f"channel_close(channel_id={channel_id}, force_close={force_close})"
+            "channel_close(channel_id={}, force_close={})", channel_id, force_close
         )
 
         try:
@@ -1013,15 +1431,17 @@ class LnNodeCLNgRPC(LightningNodeBase):
             req = ln.CloseRequest(
                 id=channel_id,
                 unilateraltimeout=wait_time_before_unilateral_close,
-                feerange=[lnp.Feerate(slow=True), lnp.Feerate(urgent=True)],
             )
-            res = await self._cln_stub.Close(req)
+            if force_close:
+                # a cooperative close negotiates with CLN's default feerange
+                req.feerange.extend(_FEERANGE)
+            res = await self._stub().Close(req)
 
             # “mutual”, “unilateral”, “unopened”
             t = res.item_type
-            if t == 0 or t == 1:  # mutual, unilateral
+            if t in _CLOSED_OK:
                 return res.txid.hex()
-            elif t == 2:  # unopened
+            elif t == _CLOSE_UNOPENED:
                 raise HTTPException(
                     status.HTTP_400_BAD_REQUEST, detail="Channel is not open yet."
                 )
@@ -1031,24 +1451,113 @@ class LnNodeCLNgRPC(LightningNodeBase):
                 detail=f"CLN returned unknown close type: {t}",
             )
         except grpc.aio._call.AioRpcError as error:
-            if "Channel is in state AWAITING_UNILATERAL" in error.details():
-                raise HTTPException(
-                    status.HTTP_400_BAD_REQUEST,
-                    detail="Channel is awaiting an unilateral close.",
-                )
+            details = error.details()
+            _raise_for_details(details, _CLOSE_ERROR_HANDLERS)
 
-            raise HTTPException(
-                status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error.details()
-            )
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, detail=details)
 
-    @logger.catch(exclude=(HTTPException,))
     def _handle_base_cln_error(self, error: grpc.aio._call.AioRpcError) -> None:
         # This method handles all errors common to all CLN calls
-        details = error.details()
+        _raise_for_details(error.details(), _BASE_ERROR_HANDLERS)
+
+    async def _rpc_connect(self) -> None:
+        if self._rpc_path is None:
+            self._rpc_path = config("cln_jrpc_path", default=_default_rpc_path())
+
+        logger.info(f"Connecting to the lightning-rpc socket at {self._rpc_path}")
+
+        self._rpc_reader, self._rpc_writer = await asyncio.open_unix_connection(
+            path=self._rpc_path,
+            limit=_SOCKET_BUFFER_SIZE_LIMIT,
+        )
+        self._rpc_pending = {}
+
+        self._rpc_read_task = asyncio.create_task(
+            self._rpc_read_loop(self._rpc_reader, self._rpc_writer, self._rpc_pending)
+        )
+
+    async def _rpc_read_loop(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        pending: dict[int, asyncio.Future],
+    ) -> None:
+        # lightningd terminates each JSON response with an empty line
+        try:
+            while True:
+                try:
+                    data = await reader.readuntil(b"\n\n")
+                except (
+                    asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError,
+                    ConnectionError,
+                ) as e:
+                    logger.warning(f"lightning-rpc socket closed: {e}")
+                    break
+
+                try:
+                    response = json.loads(data)
+                    response_id = response.get("id")
+                except (ValueError, AttributeError) as e:
+                    # we can't tell which request this belongs to,
+                    # drop the connection and let _rpc() reconnect
+                    logger.error(f"Invalid response on the lightning-rpc socket: {e}")
+                    break
+
+                future = pending.pop(response_id, None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            # runs on any exit, so waiting calls fail instead of hanging
+            # and the next _rpc() call sees the closed writer and reconnects
+            writer.close()
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionResetError("lightning-rpc socket closed")
+                    )
+            pending.clear()
+
+    def _rpc_get_lock(self) -> asyncio.Lock:
+        # created lazily, the instance is built before the event loop runs
+        if self._rpc_lock is None:
+            self._rpc_lock = asyncio.Lock()
+
+        return self._rpc_lock
+
+    async def _rpc_connect_if_closed(self) -> None:
+        # callers must hold _rpc_lock, otherwise two connects can race and
+        # the later one leaks the socket and read task of the first
+        if self._rpc_writer is None or self._rpc_writer.is_closing():
+            await self._rpc_connect()
+
+    async def _rpc(self, method: str, **params) -> dict:
+        try:
+            async with self._rpc_get_lock():
+                await self._rpc_connect_if_closed()
+
+                self._rpc_id += 1
+                future = asyncio.get_running_loop().create_future()
+                self._rpc_pending[self._rpc_id] = future
+
+                data = json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": self._rpc_id,
+                        "method": method,
+                        "params": params,
+                    }
+                )
+                self._rpc_writer.write(data.encode("utf-8"))
+                await self._rpc_writer.drain()
+
+            return await future
+        except OSError as e:
+            logger.critical(
+                f"Unable to talk to the lightning-rpc socket at {self._rpc_path}: {e}"
+            )
 
-        if details and details.find("Received RST_STREAM with error code 8") > -1:
-            logger.error(details)
             raise HTTPException(
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="CLN is responding with an error. Please check the logs.",
+                detail=f"Unable to connect to the lightning-rpc socket: {e}",
             )
@@ -128,6 +128,12 @@ class LightningNodeBase:
     async def channel_list(self) -> List[Channel]:
         raise NotImplementedError()
 
+    async def channel_list_stream(self) -> AsyncGenerator[Channel, None]:
+        # Implementations which can produce the channels one by one
+        # should override this. The order of the channels is not defined.
+        for c in await self.channel_list():
+            yield c
+
     @abstractmethod
     async def channel_close(self, channel_id: int, force_close: bool) -> str:
         raise NotImplementedError()
@@ -192,6 +192,11 @@ class LnNodeCLNgRPCBlitz(LnNodeCLNgRPC):
         self._check_if_locked()
         return await super().channel_list()
 
+    async def channel_list_stream(self) -> AsyncGenerator[Channel, None]:
+        self._check_if_locked()
+        async for c in super().channel_list_stream():
+            yield c
+
     async def channel_close(self, channel_id: int, force_close: bool) -> str:
         self._check_if_locked()
         return await super().channel_close(channel_id, force_close)
@@ -211,6 +211,18 @@ class ForwardSuccessEvent(BaseModel):
             fee_msat=fwd.fee_msat.msat,
         )
 
+    @classmethod
+    def from_cln_rpc(cls, fwd) -> "ForwardSuccessEvent":
+        # listforwards JSON output of the lightning-rpc socket
+        return cls(
+            timestamp_ns=fwd["received_time"],
+            chan_id_in=fwd["in_channel"],
+            chan_id_out=fwd["out_channel"],
+            amt_in_msat=parse_cln_msat(fwd["in_msat"]),
+            amt_out_msat=parse_cln_msat(fwd["out_msat"]),
+            fee_msat=parse_cln_msat(fwd["fee_msat"]),
+        )
+
 
 class Feature(BaseModel):
     name: str
@@ -463,16 +475,20 @@ class Channel(BaseModel):
     @classmethod
     def from_cln_grpc(cls, c, peer_alias="n/a") -> "Channel":
         # TODO: get alias and balance of the channel
-        return cls(
+        # The protobuf fields already have the declared types,
+        # so skip the validation for nodes with many channels.
+        our_msat = c.our_amount_msat.msat
+        total_msat = c.amount_msat.msat
+        return cls.construct(
             active=c.connected,
             # use channel point as id because thats needed
             #  for closing the channel with lnd
             channel_id=c.short_channel_id,
             peer_publickey=c.peer_id.hex(),
             peer_alias=peer_alias,
-            balance_local=c.our_amount_msat.msat,
-            balance_remote=c.amount_msat.msat - c.our_amount_msat.msat,
-            balance_capacity=c.amount_msat.msat,
+            balance_local=our_msat,
+            balance_remote=total_msat - our_msat,
+            balance_capacity=total_msat,
         )
 
     @classmethod
@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException, Query, status
 from fastapi.params import Depends
+from fastapi.responses import StreamingResponse
 
 from app.auth.auth_bearer import JWTBearer
 from app.lightning.docs import (
@@ -32,6 +33,7 @@ from app.lightning.service import (
     add_invoice,
     channel_close,
     channel_list,
+    channel_list_stream,
     channel_open,
     decode_pay_request,
     get_fee_revenue,
@@ -392,6 +394,45 @@ async def list_channels_path():
         raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=r.args[0])
 
 
+@router.get(
+    "/list-channels-stream",
+    name=f"{_PREFIX}.list-channels-stream",
+    summary="Streams the list of open channels",
+    description=(
+        "Same as list-channels, but each channel is sent as a single line of "
+        "JSON (NDJSON) as soon as it is available. The order is not defined."
+    ),
+    response_class=StreamingResponse,
+    response_description="One JSON encoded channel per line.",
+    dependencies=[Depends(JWTBearer())],
+    responses=responses,
+)
+async def list_channels_stream_path():
+    channels = channel_list_stream()
+
+    # wait for the first channel, so errors can still be sent as HTTP errors
+    try:
+        first = await channels.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except HTTPException:
+        raise
+    except NotImplementedError as r:
+        raise HTTPException(status.HTTP_501_NOT_IMPLEMENTED, detail=r.args[0])
+    except ValueError as r:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=r.args[0])
+
+    async def _ndjson():
+        if first is None:
+            return
+
+        yield first.json() + "\n"
+        async for c in channels:
+            yield c.json() + "\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+
 @router.post(
     "/close-channel",
     name=f"{_PREFIX}.close-channel",
@@ -166,6 +166,11 @@ async def channel_list() -> List[Channel]:
     return res
 
 
+async def channel_list_stream() -> AsyncGenerator[Channel, None]:
+    async for c in ln.channel_list_stream():
+        yield c
+
+
 async def channel_close(channel_id: int, force_close: bool) -> str:
     res = await ln.channel_close(channel_id, force_close)
     return res
@@ -36,6 +36,7 @@ from app.bitcoind.service import (
     register_bitcoin_status_gatherer,
     register_bitcoin_zmq_sub,
 )
+from app.bitcoind.utils import bitcoin_rpc_close
 from app.external.fastapi_versioning import VersionedFastAPI
 from app.lightning.models import LnInitState
 from app.lightning.router import router as ln_router
@@ -223,6 +224,7 @@ async def _initialize_lightning():
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
     await redis_plugin.terminate()
+    await bitcoin_rpc_close()
     remove_local_cookie()
 
 
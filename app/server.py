@@ -6,9 +6,15 @@ import click  # isort:skip
 @click.command()
 @click.option("--port", default="5000", help="Port to run Blitz API on")
 @click.option("--host", default="127.0.0.1", help="Host to run Blitz API on")
-def main(port, host):
+@click.option(
+    "--loop",
+    default="auto",
+    type=click.Choice(["auto", "asyncio", "uvloop"]),
+    help="Event loop implementation, auto uses uvloop if it is installed",
+)
+def main(port, host, loop):
     """Launched with `poetry run api` at root level"""
-    uvicorn.run("app.main:app", port=port, host=host)
+    uvicorn.run("app.main:app", port=port, host=host, loop=loop)
 
 
 if __name__ == "__main__":
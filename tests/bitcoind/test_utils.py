@@ -0,0 +1,88 @@
+import json
+
+import pytest
+from fastapi import status
+
+import app.bitcoind.utils as btc
+
+
+def _fake_post(results, sent):
+    async def fake_post(data):
+        reqs = json.loads(data)
+        sent.extend(reqs)
+
+        # bitcoind may answer a batch in any order
+        return [{"id": r["id"], **res} for r, res in reversed(list(zip(reqs, results)))]
+
+    return fake_post
+
+
+@pytest.mark.asyncio
+async def test_bitcoin_rpc_batch_async(monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        btc,
+        "_post",
+        _fake_post(
+            [
+                {"result": {"chain": "regtest"}, "error": None},
+                {"result": {"version": 220000}, "error": None},
+            ],
+            sent,
+        ),
+    )
+
+    res = await btc.bitcoin_rpc_batch_async(
+        [("getblockchaininfo", []), ("getnetworkinfo", [])]
+    )
+
+    assert [r["method"] for r in sent] == ["getblockchaininfo", "getnetworkinfo"]
+    assert [r["result"] for r in res] == [{"chain": "regtest"}, {"version": 220000}]
+
+
+@pytest.mark.asyncio
+async def test_bitcoin_rpc_batch_async_errors(monkeypatch):
+    monkeypatch.setattr(
+        btc,
+        "_post",
+        _fake_post(
+            [
+                {
+                    "result": None,
+                    "error": {"code": -28, "message": "Loading block index..."},
+                },
+                {"result": None, "error": {"code": -1, "message": "boom"}},
+                {"result": {"version": 220000}, "error": None},
+            ],
+            [],
+        ),
+    )
+
+    res = await btc.bitcoin_rpc_batch_async(
+        [("getblockchaininfo", []), ("getnetworkinfo", []), ("getnetworkinfo", [])]
+    )
+
+    # known messages get the same status as with bitcoin_rpc_async
+    assert res[0]["status"] == status.HTTP_425_TOO_EARLY
+    assert res[0] == btc._map_rpc_error("Loading block index...")
+    assert res[1] == {"error": "boom", "status": status.HTTP_500_INTERNAL_SERVER_ERROR}
+    assert res[2]["result"] == {"version": 220000}
+
+
+@pytest.mark.asyncio
+async def test_bitcoin_rpc_batch_async_failed(monkeypatch):
+    error = {
+        "error": "Aiohttp client error",
+        "status": status.HTTP_503_SERVICE_UNAVAILABLE,
+    }
+
+    async def fake_post(_):
+        return error
+
+    monkeypatch.setattr(btc, "_post", fake_post)
+
+    # a failed HTTP request fails every call of the batch
+    res = await btc.bitcoin_rpc_batch_async(
+        [("getblockchaininfo", []), ("getnetworkinfo", [])]
+    )
+    assert res == [error, error]
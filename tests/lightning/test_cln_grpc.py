@@ -0,0 +1,237 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import app.lightning.impl.cln_grpc as cln
+import app.lightning.impl.protos.cln.node_pb2 as ln
+import app.lightning.impl.protos.cln.primitives_pb2 as lnp
+from app.lightning.models import OnChainTransaction, TxStatus
+
+
+def _invoice(bolt11, status, expires_at, paid_at=0):
+    return ln.ListinvoicesInvoices(
+        bolt11=bolt11,
+        status=status,
+        expires_at=expires_at,
+        paid_at=paid_at,
+        amount_msat=lnp.Amount(msat=1000),
+        amount_received_msat=lnp.Amount(msat=1000),
+    )
+
+
+def _pay(bolt11, status, created_at):
+    return SimpleNamespace(
+        bolt11=bolt11,
+        status=status,
+        created_at=created_at,
+        amount_msat=lnp.Amount(msat=2000),
+        amount_sent_msat=lnp.Amount(msat=2001),
+    )
+
+
+def _onchain(tx_hash, block_height):
+    return OnChainTransaction(
+        tx_hash=tx_hash,
+        amount=5000,
+        num_confirmations=0,
+        block_height=block_height,
+        time_stamp=0,
+        total_fees=0,
+        dest_addresses=[],
+        label="",
+    )
+
+
+class _Stub:
+    async def ListInvoices(self, _):
+        return ln.ListinvoicesResponse(
+            invoices=[
+                _invoice("inv_paid", ln.ListinvoicesInvoices.PAID, 90, paid_at=50),
+                _invoice("inv_unpaid", ln.ListinvoicesInvoices.UNPAID, 40),
+                _invoice("inv_expired", ln.ListinvoicesInvoices.EXPIRED, 30),
+            ]
+        )
+
+    async def ListPays(self, _):
+        return SimpleNamespace(
+            pays=[
+                _pay("pay_ok", ln.ListpaysPays.COMPLETE, 20),
+                _pay("pay_failed", ln.ListpaysPays.FAILED, 60),
+            ]
+        )
+
+
+@pytest.fixture
+def node(monkeypatch):
+    node = cln.LnNodeCLNgRPC()
+    node._stubs = [_Stub()]
+    node.decoded = []
+
+    async def fake_list_on_chain_tx():
+        # both on chain txs have time_stamp 0, so their order is a tie
+        return [_onchain("tx_conf", 99), _onchain("tx_unconf", 100)]
+
+    async def fake_get_block_height():
+        return 100
+
+    async def fake_decode_pay_request(bolt11):
+        node.decoded.append(bolt11)
+        return SimpleNamespace(description="", num_msat=2000)
+
+    monkeypatch.setattr(node, "list_on_chain_tx", fake_list_on_chain_tx)
+    monkeypatch.setattr(node, "get_block_height", fake_get_block_height)
+    monkeypatch.setattr(node, "decode_pay_request", fake_decode_pay_request)
+
+    return node
+
+
+@pytest.mark.asyncio
+async def test_list_all_tx_order(node):
+    txs = await node.list_all_tx(
+        successful_only=False, index_offset=0, max_tx=0, reversed=False
+    )
+    assert [t.id for t in txs] == [
+        "tx_conf",
+        "tx_unconf",
+        "pay_ok",
+        "inv_expired",
+        "inv_unpaid",
+        "inv_paid",
+        "pay_failed",
+    ]
+    assert [t.index for t in txs] == list(range(7))
+
+    txs = await node.list_all_tx(
+        successful_only=False, index_offset=0, max_tx=0, reversed=True
+    )
+    # sorted first, then reversed, ties included
+    assert [t.id for t in txs] == [
+        "pay_failed",
+        "inv_paid",
+        "inv_unpaid",
+        "inv_expired",
+        "pay_ok",
+        "tx_unconf",
+        "tx_conf",
+    ]
+    assert [t.index for t in txs] == list(range(7))
+
+
+@pytest.mark.asyncio
+async def test_list_all_tx_successful_only(node):
+    txs = await node.list_all_tx(
+        successful_only=True, index_offset=0, max_tx=0, reversed=False
+    )
+    assert [t.id for t in txs] == ["tx_conf", "pay_ok", "inv_paid"]
+    assert all(t.status == TxStatus.SUCCEEDED for t in txs)
+
+
+@pytest.mark.asyncio
+async def test_list_all_tx_page(node):
+    txs = await node.list_all_tx(
+        successful_only=False, index_offset=2, max_tx=3, reversed=True
+    )
+    assert [t.id for t in txs] == ["inv_unpaid", "inv_expired", "pay_ok"]
+    assert [t.index for t in txs] == [2, 3, 4]
+
+    # only the bolt11s of the requested page are decoded
+    assert node.decoded == ["pay_ok"]
+
+    txs = await node.list_all_tx(
+        successful_only=False, index_offset=6, max_tx=3, reversed=True
+    )
+    assert [t.id for t in txs] == ["tx_conf"]
+    assert [t.index for t in txs] == [6]
+
+
+def _broadcaster(items, error=None):
+    runs = []
+
+    async def source():
+        runs.append(1)
+        for i in items:
+            await asyncio.sleep(0)
+            yield i
+
+        if error is not None:
+            raise error
+
+    return cln._Broadcaster(source), runs
+
+
+async def _collect(b, n=None):
+    out = []
+    sub = b.subscribe()
+    try:
+        async for item in sub:
+            out.append(item)
+            if len(out) == n:
+                break
+    finally:
+        # run the unsubscribe right away instead of on garbage collection
+        await sub.aclose()
+
+    return out
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_fan_out():
+    b, runs = _broadcaster(range(5))
+
+    res = await asyncio.wait_for(asyncio.gather(_collect(b), _collect(b)), 1)
+
+    # both subscribers share a single run of the source, which ends them
+    assert res == [[0, 1, 2, 3, 4], [0, 1, 2, 3, 4]]
+    assert runs == [1]
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_error():
+    b, runs = _broadcaster(range(2), error=RuntimeError("boom"))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await asyncio.wait_for(_collect(b), 1)
+
+    # the next subscriber restarts the source
+    with pytest.raises(RuntimeError, match="boom"):
+        await asyncio.wait_for(_collect(b), 1)
+
+    assert runs == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_cancel_on_last_unsubscribe():
+    cancelled = asyncio.Event()
+
+    async def source():
+        try:
+            for i in range(1000):
+                await asyncio.sleep(0)
+                yield i
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    b = cln._Broadcaster(source)
+
+    res = await asyncio.wait_for(asyncio.gather(_collect(b, 2), _collect(b, 3)), 1)
+    assert res == [[0, 1], [0, 1, 2]]
+    assert b._task is None
+    assert not b._queues
+
+    await asyncio.wait_for(cancelled.wait(), 1)
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_slow_subscriber():
+    async def source():
+        for i in range(10):
+            yield i
+
+    b = cln._Broadcaster(source, maxsize=3)
+
+    # the source runs ahead, the full queue drops the oldest items,
+    # but never the end marker
+    res = await asyncio.wait_for(_collect(b), 1)
+    assert res == [8, 9]